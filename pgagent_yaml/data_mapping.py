@@ -1,3 +1,6 @@
+from functools import partial
+from itertools import compress
+
 from .models.schedule import Weekday
 from .pg import Pg
 
@@ -9,16 +12,14 @@ def switch_key_value(data):
     }
 
 
-def without(row, key):
-    row = dict(row)
-    if isinstance(key, str):
-        if key in row:
-            del row[key]
-    else:
-        for _key in key:
-            if _key in row:
-                del row[_key]
-    return row
+def without(row, keys):
+    if isinstance(keys, str):
+        keys = (keys,)
+    return {
+        key: value
+        for key, value in row.items()
+        if key not in keys
+    }
 
 
 job_classes_query = '''
@@ -69,10 +70,46 @@ class PgToYamlMapping:
         's': 'sql',
         'b': 'batch'
     }
+    schedule_flag_aliases = {
+        'minutes': tuple(range(60)),
+        'hours': tuple(range(24)),
+        'monthdays': tuple(range(1, 32)) + ('last day',),
+        'months': tuple(range(1, 13)),
+        'weekdays': tuple(Weekday.get_values()),
+    }
     job_classes: dict[int, str]
 
     def __init__(self, pg: Pg):
         self.pg = pg
+        self.table_columns = {
+            'pgagent.pga_job': self.job_columns,
+            'pgagent.pga_jobstep': self.step_columns,
+            'pgagent.pga_schedule': self.schedule_columns,
+        }
+        self.value_mappers = self.get_value_mappers()
+
+    def get_value_mappers(self):
+        # keyed by yaml column names, job classes are loaded later
+        mappers = {
+            'pgagent.pga_job': {
+                'class': lambda value: self.job_classes[value],
+            },
+            'pgagent.pga_jobstep': {
+                'kind': self.step_kinds.__getitem__,
+                'on_error': self.step_on_errors.__getitem__,
+            },
+            'pgagent.pga_schedule': {
+                column: partial(self.map_flags, aliases=aliases)
+                for column, aliases in self.schedule_flag_aliases.items()
+            },
+        }
+        res = {}
+        for table, columns in self.table_columns.items():
+            for column, mapped_column in columns.items():
+                mapper = mappers[table].get(column) or mappers[table].get(mapped_column)
+                if mapper:
+                    res[table, column] = mapper
+        return res
 
     async def load_job_classes(self):
         self.job_classes = {
@@ -81,76 +118,55 @@ class PgToYamlMapping:
         }
 
     def map_column(self, table, column):
-        if table == 'pgagent.pga_job':
-            return self.job_columns[column]
-        if table == 'pgagent.pga_jobstep':
-            return self.step_columns[column]
-        if table == 'pgagent.pga_schedule':
-            return self.schedule_columns[column]
+        return self.table_columns[table][column]
 
     def map_value(self, table, column, value):
-        columns = (column, self.map_column(table, column))
-        if table == 'pgagent.pga_job':
-            if 'class' in columns:
-                return self.job_classes[value]
-        if table == 'pgagent.pga_jobstep':
-            if 'kind' in columns:
-                return self.step_kinds[value]
-            if 'on_error' in columns:
-                return self.step_on_errors[value]
-        if table == 'pgagent.pga_schedule':
-            if 'minutes' in columns:
-                return self.map_flags(value, range(60))
-            if 'hours' in columns:
-                return self.map_flags(value, range(24))
-            if 'monthdays' in columns:
-                return self.map_flags(value, list(range(1, 32)) + ['last day'])
-            if 'months' in columns:
-                return self.map_flags(value, range(1, 13))
-            if 'weekdays' in columns:
-                return self.map_flags(value, Weekday.get_values())
-        return value
+        mapper = self.value_mappers.get((table, column))
+        return mapper(value) if mapper else value
 
     def map_table_row(self, table, row):
+        columns = self.table_columns[table]
         return {
-            self.map_column(table, key): self.map_value(table, key, value)
+            columns[key]: self.map_value(table, key, value)
             for key, value in row.items()
         }
 
     def map_table(self, table, rows):
-        return [
+        return (
             self.map_table_row(table, row)
             for row in rows
-        ]
+        )
 
     def map_data(self, jobs, schedules, steps):
         jobs = self.map_table('pgagent.pga_job', jobs)
         schedules = self.map_table('pgagent.pga_schedule', schedules)
         steps = self.map_table('pgagent.pga_jobstep', steps)
-        jobs = {
-            job['id']: dict(without(job, 'id'), schedules={}, steps={})
-            for job in jobs
-        }
+        # mapped rows are fresh dicts, so they are reshaped in place
+        jobs_by_id = {}
+        for job in jobs:
+            job_id = job.pop('id')
+            job['schedules'] = {}
+            job['steps'] = {}
+            jobs_by_id[job_id] = job
         for schedule in schedules:
-            jobs[schedule['job_id']]['schedules'][schedule['name']] = without(schedule, ('job_id', 'name'))
+            job_schedules = jobs_by_id[schedule.pop('job_id')]['schedules']
+            job_schedules[schedule.pop('name')] = schedule
         for step in steps:
-            jobs[step['job_id']]['steps'][step['name']] = without(step, ('job_id', 'name'))
+            job_steps = jobs_by_id[step.pop('job_id')]['steps']
+            job_steps[step.pop('name')] = step
         return {
             job.pop('name'): job
-            for job in jobs.values()
+            for job in jobs_by_id.values()
         }
 
     @staticmethod
     def map_flags(flags, aliases):
-        if all(flags):
+        res = list(compress(aliases, flags))
+        if len(res) == len(flags):
             return '*'
-        if not any(flags):
+        if not res:
             return '-'
-        return [
-            alias
-            for flag, alias in zip(flags, aliases)
-            if flag
-        ]
+        return res
 
 
 class YamlToPgMapping(PgToYamlMapping):
@@ -167,9 +183,12 @@ class YamlToPgMapping(PgToYamlMapping):
 
     @staticmethod
     def map_flags(flags, aliases):
-        res = ",".join(
-            't' if flags != '-' and (flags == '*' or alias in flags) else 'f'
+        if flags == '*':
+            return [True] * len(aliases)
+        if flags == '-':
+            return [False] * len(aliases)
+        flags = set(flags)
+        return [
+            alias in flags
             for alias in aliases
-        )
-        res = f'{{{res}}}'
-        return res
+        ]
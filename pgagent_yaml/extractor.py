@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import os
 import sys
 
@@ -12,21 +13,25 @@ class Extractor:
         self.args = args
         self.pg = pg
         self.map = PgToYamlMapping(pg)
-        self.formatter = Formatter()
+        self.formatter = Formatter(args.safe_dump)
 
     async def export(self) -> None:
         jobs = await self.get_jobs()
         for job_name, job in jobs.items():
-            file_name = os.path.join(self.args.out_dir, f"{job_name}.yaml")
-            self.formatter.dump({job_name: job}, file_name)
+            self.dump_job(job_name, job)
+
+    def dump_job(self, job_name: str, job: dict) -> None:
+        file_name = os.path.join(self.args.out_dir, f"{job_name}.yaml")
+        self.formatter.dump({job_name: job}, file_name)
 
     async def get_jobs(self) -> dict:
-        await self.map.load_job_classes()
-        jobs = self.map.map_data(
-            await self.get_jobs_data(),
-            await self.get_schedules_data(),
-            await self.get_steps_data(),
+        _, jobs_data, schedules_data, steps_data = await asyncio.gather(
+            self.map.load_job_classes(),
+            self.get_jobs_data(),
+            self.get_schedules_data(),
+            self.get_steps_data(),
         )
+        jobs = self.map.map_data(jobs_data, schedules_data, steps_data)
         if not self.args.include_schedule_start_end:
             self.del_schedules_start_end(jobs)
         return jobs
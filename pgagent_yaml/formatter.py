@@ -1,25 +1,172 @@
+import datetime
+import re
+
 import yaml
+from yaml.nodes import ScalarNode
+from yaml.resolver import Resolver
+
+STR_TAG = 'tag:yaml.org,2002:str'
+INDENT = '  '
+# printable characters which PyYAML emits without escaping (line breaks excluded)
+printable_re = re.compile(
+    '[\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010fffe]*'
+)
+resolver = Resolver()
+
+
+def str_presenter(dumper, data):
+    if '\n' in data:
+        return dumper.represent_scalar(STR_TAG, data, style='|')
+    return dumper.represent_scalar(STR_TAG, data)
+
+
+# pure-python on purpose: libyaml escapes characters above U+FFFF
+# and picks other key styles, which would change exported files
+class JobDumper(yaml.SafeDumper):
+    pass
+
+
+JobDumper.add_representer(str, str_presenter)
+
+
+class UnsupportedValue(Exception):
+    pass
+
+
+def is_plain(value: str) -> bool:
+    if (
+        not value
+        or value.startswith((' ', '---', '...'))
+        or value.endswith((' ', ':'))
+        or value[0] in '#,[]{}&*!|>\'"%@`'
+        or value[0] in '?:-' and value[1:2] in ('', ' ')
+        or ': ' in value
+        or ' #' in value
+    ):
+        return False
+    return resolver.resolve(ScalarNode, value, (True, False)) == STR_TAG
+
+
+def quote_scalar(value: str) -> str:
+    if not printable_re.fullmatch(value):
+        raise UnsupportedValue(value)
+    if is_plain(value):
+        return value
+    return "'" + value.replace("'", "''") + "'"
+
+
+def emit_key(key) -> str:
+    # PyYAML writes longer keys in the explicit '? key' form
+    if not isinstance(key, str) or not key or len(key) >= 123:
+        raise UnsupportedValue(key)
+    return quote_scalar(key)
+
+
+def emit_scalar(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(' ')
+    if isinstance(value, str):
+        return quote_scalar(value)
+    raise UnsupportedValue(value)
+
+
+def emit_literal(value: str, indent: str, out: list[str]) -> None:
+    if (
+        value.startswith((' ', '\n'))
+        or value.endswith((' ', '\n\n'))
+        or ' \n' in value
+        or not printable_re.fullmatch(value.replace('\n', ''))
+    ):
+        raise UnsupportedValue(value)
+    if value.endswith('\n'):
+        out.append('|\n')
+        value = value[:-1]
+    else:
+        out.append('|-\n')
+    for line in value.split('\n'):
+        out.append(f'{indent}{line}\n' if line else '\n')
+
+
+def emit_mapping(data: dict, indent: str, out: list[str]) -> None:
+    for key, value in data.items():
+        out.append(f'{indent}{emit_key(key)}:')
+        if isinstance(value, dict):
+            if value:
+                out.append('\n')
+                emit_mapping(value, indent + INDENT, out)
+            else:
+                out.append(' {}\n')
+        elif isinstance(value, list):
+            if value:
+                out.append('\n')
+                for item in value:
+                    out.append(f'{indent}- {emit_scalar(item)}\n')
+            else:
+                out.append(' []\n')
+        elif isinstance(value, str) and '\n' in value:
+            out.append(' ')
+            emit_literal(value, indent + INDENT, out)
+        else:
+            out.append(f' {emit_scalar(value)}\n')
+
+
+# emits jobs exactly as yaml.dump does, raises UnsupportedValue otherwise
+def fast_dump(job: dict) -> str:
+    out = []
+    emit_mapping(job, '', out)
+    return ''.join(out)
+
+
+def fast_dump_named(name: str, job: dict) -> str:
+    out = [f'{emit_key(name)}:\n']
+    emit_mapping(job, INDENT, out)
+    return ''.join(out)
 
 
 class Formatter:
-    def __init__(self):
-        def str_presenter(dumper, data):
-            if '\n' in data:
-                return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-            return dumper.represent_scalar('tag:yaml.org,2002:str', data)
-        yaml.add_representer(str, str_presenter)
+    def __init__(self, safe_dump: bool = False):
+        self.safe_dump = safe_dump
 
-    @staticmethod
-    def dump(job: dict, file_name: str = None):
+    def dump(self, job: dict, file_name: str = None):
         if job is None:
             return ''
-        file = None
+        data = self._dump(job)
         if file_name:
-            file = open(file_name, 'w')
+            with open(file_name, 'w', encoding='utf-8') as file:
+                file.write(data)
+        return data
+
+    def dump_named(self, name: str, job: dict) -> str:
+        if not job:
+            return ''
+        if not self.safe_dump:
+            try:
+                return fast_dump_named(name, job)
+            except UnsupportedValue:
+                pass
+        return self._yaml_dump({name: job})
+
+    def _dump(self, job: dict) -> str:
+        if not self.safe_dump:
+            try:
+                return fast_dump(job)
+            except UnsupportedValue:
+                pass
+        return self._yaml_dump(job)
+
+    @staticmethod
+    def _yaml_dump(job: dict) -> str:
         return yaml.dump(
             job,
-            file,
+            Dumper=JobDumper,
             allow_unicode=True,
+            default_flow_style=False,
             sort_keys=False,
             width=float('inf')
         )
@@ -12,19 +12,19 @@ node_format = 'migration_path -> [user@]host:port/database'
 
 
 async def run(args):
-    if args.command == 'export':
-        pg = Pg(args)
-        await pg.init()
-        await Extractor(args, pg).export()
-
-    elif args.command == 'sync':
-        pg = Pg(args)
-        await pg.init()
-        await Synchronizer(args, pg).sync()
-
-    else:
+    if args.command not in ('export', 'sync'):
         raise Exception(f'unknown command {args.command}')
 
+    pg = Pg(args)
+    await pg.init()
+    try:
+        if args.command == 'export':
+            await Extractor(args, pg).export()
+        else:
+            await Synchronizer(args, pg).sync()
+    finally:
+        await pg.close()
+
 
 def main():
     def add_connection_args(parser):
@@ -82,6 +82,11 @@ def main():
         action="store_true",
         help='include "start", "end" fields (without by default)'
     )
+    parser_export.add_argument(
+        '--safe-dump',
+        action="store_true",
+        help='format yaml by PyYAML only (slower)'
+    )
 
     parser_sync = subparsers.add_parser(
         'sync',
@@ -114,6 +119,11 @@ def main():
         action="store_true",
         help='try exporting an unsupported server version'
     )
+    parser_sync.add_argument(
+        '--safe-dump',
+        action="store_true",
+        help='format yaml by PyYAML only (slower)'
+    )
 
     args = arg_parser.parse_args()
 
@@ -1,9 +1,12 @@
 import datetime
+import re
 import sys
+from contextlib import asynccontextmanager
 
 import asyncpg
 
 
+# display only: queries are executed with bound parameters
 def quote_literal(value):
     if value is None:
         return 'null'
@@ -11,11 +14,27 @@ def quote_literal(value):
         return "'" + value.replace("'", "''") + "'"
     elif isinstance(value, (int, bool)):
         return str(value).lower()
+    elif isinstance(value, datetime.datetime):
+        # asyncpg binds naive timestamps in the client's local time zone
+        if value.tzinfo is None:
+            value = value.astimezone()
+        return quote_literal(value.isoformat(' '))
+    elif isinstance(value, (list, tuple)):
+        flags = ','.join('t' if flag else 'f' for flag in value)
+        return f"'{{{flags}}}'"
     raise TypeError(f'Unknown type for quote value: {value}')
 
 
+def render_query(query, params):
+    return re.sub(
+        r'\$(\d+)',
+        lambda match: quote_literal(params[int(match.group(1)) - 1]),
+        query
+    )
+
+
 class Pg:
-    con: asyncpg.Connection
+    pool: asyncpg.Pool
     compatible_version = {
         'from': (3, 2),
         'to': (4, 2)
@@ -26,23 +45,34 @@ class Pg:
         self.args = args
 
     async def init(self):
-        self.con = await asyncpg.connect(
+        self.pool = await asyncpg.create_pool(
             database=self.args.dbname,
             user=self.args.user,
             password=self.args.password,
             host=self.args.host,
             port=self.args.port,
             statement_cache_size=0,
+            min_size=1,
+            max_size=4,
         )
         await self.check_version()
-        self.now = (await self.fetch('select now()'))[0]['now']
+        self.now = await self.fetchval('select now()')
 
-    async def fetch(self, query: str, **params) -> list[dict]:
-        rows = await self.con.fetch(query, *params)
+    async def close(self):
+        await self.pool.close()
+
+    async def fetch(self, query: str, *params) -> list[dict]:
+        rows = await self.pool.fetch(query, *params)
         return [dict(row) for row in rows]
 
-    async def execute(self, query: str, **params) -> None:
-        await self.con.execute(query, *params)
+    async def fetchval(self, query: str, *params):
+        return await self.pool.fetchval(query, *params)
+
+    @asynccontextmanager
+    async def transaction(self):
+        async with self.pool.acquire() as con:
+            async with con.transaction():
+                yield con
 
     async def get_pgagent_version(self) -> tuple[int, int]:
         ver = await self.fetch('''
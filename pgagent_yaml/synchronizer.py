@@ -1,15 +1,22 @@
 import argparse
 import os
 import sys
+from itertools import groupby
+from operator import itemgetter
 
 import yaml
 from pydantic import ValidationError
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 from .extractor import Extractor
 from .data_mapping import YamlToPgMapping, without
 from .formatter import Formatter
 from .models.job import Job
-from .pg import Pg, quote_literal
+from .pg import Pg, render_query
 from .str_diff import color_str_diff
 
 
@@ -19,20 +26,16 @@ class Synchronizer:
         self.pg = pg
         self.extractor = Extractor(args, pg)
         self.map = YamlToPgMapping(pg)
-        self.formatter = Formatter()
+        self.formatter = Formatter(args.safe_dump)
         self.is_dir = os.path.isdir(self.args.source)
 
     async def sync(self):
         await self.map.load_job_classes()
         src_jobs = self.load_jobs()
         self.args.include_schedule_start_end = any(
-            True
-            for job_name, job in src_jobs.items()
-            if any(
-                True
-                for schedule in job['schedules']
-                if 'start' in schedule
-            )
+            'start' in schedule
+            for job in src_jobs.values()
+            for schedule in job['schedules'].values()
         )
         dst_jobs = await self.extractor.get_jobs()
         diff = self.get_diff(src_jobs, dst_jobs)
@@ -46,21 +49,23 @@ class Synchronizer:
     def load_jobs(self) -> dict[str, dict]:
         jobs = {}
         if self.is_dir:
-            file_names = (
-                os.path.join(self.args.source, file_name)
-                for file_name in os.listdir(self.args.source)
-            )
+            with os.scandir(self.args.source) as entries:
+                file_names = [entry.path for entry in entries if entry.is_file()]
         else:
             file_names = [self.args.source]
 
-        for file_name in file_names:
-            job = yaml.safe_load(open(file_name))
-            job_name = next(iter(job.keys()))
-            job_data = job[job_name]
+        for file_name, job_name, job_data in map(self.load_job, file_names):
             self.validate_job(file_name, job_name, job_data)
             jobs[job_name] = job_data
         return jobs
 
+    @staticmethod
+    def load_job(file_name):
+        with open(file_name, 'rb') as file:
+            job = yaml.load(file, Loader=SafeLoader)
+        job_name, job_data = next(iter(job.items()))
+        return file_name, job_name, job_data
+
     @staticmethod
     def validate_job(file_name, job_name, job_data):
         try:
@@ -82,10 +87,14 @@ class Synchronizer:
 
             if src_job and dst_job:
                 # del same data
-                for key in list(src_job.keys()):
-                    if src_job.get(key) == dst_job.get(key):
-                        del src_job[key]
-                        del dst_job[key]
+                same_keys = [
+                    key
+                    for key, value in src_job.items()
+                    if value == dst_job.get(key)
+                ]
+                for key in same_keys:
+                    del src_job[key]
+                    dst_job.pop(key, None)
 
             if src_job != dst_job:
                 res.append((job_name, src_job, dst_job))
@@ -95,8 +104,8 @@ class Synchronizer:
         for job_name, src, dst in diff:
             print(
                 color_str_diff(
-                    self.formatter.dump({job_name: dst} if dst else None),
-                    self.formatter.dump({job_name: src} if src else None),
+                    self.formatter.dump_named(job_name, dst),
+                    self.formatter.dump_named(job_name, src),
                 )
             )
 
@@ -106,15 +115,24 @@ class Synchronizer:
         return result == 'y'
 
     async def apply_changes(self, diff):
+        jobs_queries = []
         for job_name, src, dst in diff:
-            queries = [f'--job: {job_name}']
+            queries = []
             queries.extend(self.get_apply_job_queries(job_name, src, dst))
             queries.extend(self.get_apply_table_queries(job_name, src, dst, 'pgagent.pga_jobstep', 'steps'))
             queries.extend(self.get_apply_table_queries(job_name, src, dst, 'pgagent.pga_schedule', 'schedules'))
-            queries = '\n'.join(queries)
-            self.print_query(queries)
-            if not self.args.dry_run:
-                await self.pg.execute(queries)
+            self.print_query('\n'.join(
+                [f'--job: {job_name}'] + [
+                    render_query(query, params)
+                    for query, params in queries
+                ]
+            ))
+            jobs_queries.extend(queries)
+        if not self.args.dry_run:
+            async with self.pg.transaction() as con:
+                # runs of the same statement are pipelined, their order is kept
+                for query, queries in groupby(jobs_queries, key=itemgetter(0)):
+                    await con.executemany(query, [params for _, params in queries])
 
     def print_query(self, query):
         if not self.args.echo_queries:
@@ -122,45 +140,57 @@ class Synchronizer:
         executed = ' (not executed)' if self.args.dry_run else ''
         print(f'\033[33mQUERY{executed}: {query}\033[0m\n')
 
-    def get_job_id_by_name_query(self, job_name):
+    @staticmethod
+    def add_param(params, value):
+        params.append(value)
+        return f'${len(params)}'
+
+    def get_job_id_by_name_query(self, job_name, params):
         table = 'pgagent.pga_job'
         id_column = self.map.map_column(table, 'id')
         name_column = self.map.map_column(table, 'name')
-        job_name = quote_literal(job_name)
+        job_name = self.add_param(params, job_name)
         return f'(select {id_column} from {table} where {name_column} = {job_name})'
 
-    def get_job_name_filter(self, table, job_name):
+    def get_job_name_filter(self, table, job_name, params):
         if job_name:
             column = self.map.map_column(table, 'job_id')
-            subquery = self.get_job_id_by_name_query(job_name)
+            subquery = self.get_job_id_by_name_query(job_name, params)
             return f" and {column} = {subquery}"
         return ''
 
     def get_insert_query(self, table, name, data, job_name=None):
+        params = []
         data = self.map.map_table_row(table, dict(name=name, **data))
         columns = ', '.join(data.keys())
-        values = ', '.join(map(quote_literal, data.values()))
+        values = ', '.join(
+            self.add_param(params, value)
+            for value in data.values()
+        )
         if job_name:
             columns += f", {self.map.map_column(table, 'job_id')}"
-            values += f", {self.get_job_id_by_name_query(job_name)}"
-        return f'insert into {table}({columns}) values ({values});'
+            values += f", {self.get_job_id_by_name_query(job_name, params)}"
+        return f'insert into {table}({columns}) values ({values});', params
 
     def get_update_query(self, table, name, data, job_name=None):
+        params = []
         data = self.map.map_table_row(table, data)
         values = ', '.join(
-            f'{key} = {quote_literal(value)}'
+            f'{key} = {self.add_param(params, value)}'
             for key, value in data.items()
         )
         name_column = self.map.map_column(table, 'name')
-        name_value = quote_literal(name)
-        job_name_filter = self.get_job_name_filter(table, job_name)
-        return f'update {table} set {values} where {name_column} = {name_value}{job_name_filter};'
+        name_value = self.add_param(params, name)
+        job_name_filter = self.get_job_name_filter(table, job_name, params)
+        query = f'update {table} set {values} where {name_column} = {name_value}{job_name_filter};'
+        return query, params
 
     def get_delete_query(self, table, name, job_name=None):
+        params = []
         name_column = self.map.map_column(table, 'name')
-        name_value = quote_literal(name)
-        job_name_filter = self.get_job_name_filter(table, job_name)
-        return f'delete from {table} where {name_column} = {name_value}{job_name_filter};'
+        name_value = self.add_param(params, name)
+        job_name_filter = self.get_job_name_filter(table, job_name, params)
+        return f'delete from {table} where {name_column} = {name_value}{job_name_filter};', params
 
     def get_apply_job_queries(self, job_name, src, dst):
         if src:
@@ -0,0 +1,106 @@
+import datetime
+
+import pytest
+
+from pgagent_yaml.formatter import Formatter, UnsupportedValue, fast_dump
+
+
+def make_job(**step):
+    return {
+        'daily report': {
+            'enabled': True,
+            'description': None,
+            'class': 'Routine Maintenance',
+            'schedules': {
+                'every night': {
+                    'enabled': True,
+                    'description': 'nightly 🚀',
+                    'start': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+                    'end': None,
+                    'minutes': [0, 30],
+                    'hours': '*',
+                    'monthdays': [1, 'last day'],
+                    'months': '-',
+                    'weekdays': ['monday', 'friday'],
+                },
+            },
+            'steps': {
+                'step 1': dict(
+                    {
+                        'enabled': False,
+                        'description': '',
+                        'kind': 'sql',
+                        'on_error': 'fail',
+                        'connection_string': None,
+                        'local_database': 'postgres',
+                        'code': 'select 1;',
+                    },
+                    **step
+                ),
+            },
+        },
+    }
+
+
+@pytest.mark.parametrize('step', [
+    {},
+    {'code': 'select 1;\nselect 2;\n'},
+    {'code': 'select 1; -- done 🎉\n\n  select 2;'},
+    {'code': "select 'a: b' # c\n"},
+    {'description': 'yes'},
+    {'description': 'null'},
+    {'description': '1.5'},
+    {'description': '2024-01-01'},
+    {'description': "it's: 'quoted'"},
+    {'description': '*'},
+    {'description': '- item'},
+    {'description': ' padded '},
+    {'description': 'юникод 😀'},
+    {'schedules': {}, 'steps': {}},
+    {'kind': 'batch', 'on_error': 'ignore', 'code': '#!/bin/sh\necho "$1"\n'},
+])
+def test_fast_dump_matches_yaml(step):
+    job = make_job(**step)
+    assert fast_dump(job) == Formatter(safe_dump=True).dump(job)
+
+
+@pytest.mark.parametrize('name', ['a' * 122, 'a' * 123, "'quoted' job", 'on'])
+def test_fast_dump_keys(name):
+    job = {name: {'enabled': True}}
+    try:
+        data = fast_dump(job)
+    except UnsupportedValue:
+        data = None
+    expected = Formatter(safe_dump=True).dump(job)
+    assert data in (None, expected)
+    assert Formatter().dump(job) == expected
+
+
+@pytest.mark.parametrize('step', [
+    {'code': 'select 1;\n\tselect 2;\n'},
+    {'code': 'select 1; \nselect 2;'},
+    {'code': '\nselect 1;'},
+    {'code': 'select 1;\n\n'},
+    {'description': 'a\x85b'},
+    {'description': 1.5},
+])
+def test_fallback_matches_yaml(step):
+    job = make_job(**step)
+    with pytest.raises(UnsupportedValue):
+        fast_dump(job)
+    assert Formatter().dump(job) == Formatter(safe_dump=True).dump(job)
+
+
+def test_dump_named():
+    job = make_job(code='select 1;\nselect 2;\n')
+    name, body = next(iter(job.items()))
+    assert Formatter().dump_named(name, body) == Formatter(safe_dump=True).dump(job)
+    assert Formatter().dump_named(name, None) == ''
+    assert Formatter().dump_named(name, {}) == ''
+
+
+def test_dump_file(tmp_path):
+    job = make_job()
+    file_name = tmp_path / 'daily report.yaml'
+    data = Formatter().dump(job, str(file_name))
+    assert file_name.read_text(encoding='utf-8') == data